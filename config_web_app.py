@@ -1,25 +1,55 @@
 from __future__ import annotations
 
-import json
+import functools
+import html
+import os
 import re
+import string
+import tempfile
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
+
+import orjson
+from flask import Flask, Response, jsonify, render_template, request
+from flask.json.provider import JSONProvider
+from werkzeug.exceptions import RequestEntityTooLarge
+
+
+class OrjsonProvider(JSONProvider):
+    """Route Flask's JSON encode/decode (jsonify, get_json) through orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype="application/json")
 
-from flask import Flask, jsonify, render_template, request
 
 app = Flask(__name__)
-app.config["JSON_SORT_KEYS"] = False
+app.json = OrjsonProvider(app)
+app.config["MAX_CONTENT_LENGTH"] = 4 * 1024 * 1024
+# Config documents are small; reject anything bigger before parsing it.
+CONFIG_PAYLOAD_LIMIT = 512 * 1024
 
 BASE_DIR = Path(__file__).resolve().parent
 CONFIG_DIR = BASE_DIR / "configs"
 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 REPORT_PROFILE_PATH = BASE_DIR / "report_profile.json"
 
-NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+NAME_CHARS = frozenset(string.ascii_letters + string.digits + "_.-")
 FORMULA_TOKEN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
 
+# Normalised config JSON keyed by path, tagged with the (st_mtime_ns, st_size) it was read at.
+# Hits re-parse the bytes, which hands each caller its own dict more cheaply than a deepcopy.
+_CONFIG_CACHE: Dict[Path, Tuple[int, int, bytes]] = {}
+
 DEFAULT_REPORT_PROFILE = {
     "summary_fields": [
         {"label": "Client Name", "source": "client_name"},
@@ -44,122 +74,136 @@ DEFAULT_REPORT_PROFILE = {
 }
 
 
+def _read_json(path: Path) -> Any:
+    raw = path.read_bytes()
+    if raw.startswith(b"\xef\xbb\xbf"):
+        raw = raw[3:]
+    return orjson.loads(raw)
+
+
+def _write_json(path: Path, payload: Any) -> None:
+    data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    # A unique temp file per write, so concurrent saves of one path never share it.
+    # mkstemp opens in binary mode, so Windows does not translate newlines.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
 def load_report_profile() -> Dict[str, Any]:
     if REPORT_PROFILE_PATH.exists():
-        with REPORT_PROFILE_PATH.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+        return _read_json(REPORT_PROFILE_PATH)
     return DEFAULT_REPORT_PROFILE
 
 
 REPORT_PROFILE = load_report_profile()
+# Encoded form of REPORT_PROFILE, built on first read and replaced on every update.
+_REPORT_PROFILE_BYTES: bytes | None = None
+
+
+_DETAIL_ROW_KEYS = tuple(
+    (f"{side}_label", f"{side}_type", f"{side}_source", f"{side}_text") for side in ("left", "right")
+)
 
 
-def validate_detail_rows(detail_rows: Any) -> Any:
+def validate_detail_rows(detail_rows: Any, collect_all: bool = True) -> Any:
     if not isinstance(detail_rows, list):
         return "Must be an array."
     row_errors: Dict[int, Any] = {}
+    err: Dict[str, str] = {}
     for idx, row in enumerate(detail_rows):
         if not isinstance(row, dict):
             row_errors[idx] = "Each row must be an object."
+            if not collect_all:
+                break
             continue
-        for side in ("left", "right"):
-            label_key = f"{side}_label"
-            type_key = f"{side}_type"
-            source_key = f"{side}_source"
-            text_key = f"{side}_text"
-            if not row.get(label_key):
-                row_errors.setdefault(idx, {})[label_key] = "Label required."
-            value_type = row.get(type_key) or "field"
+        get = row.get
+        for label_key, type_key, source_key, text_key in _DETAIL_ROW_KEYS:
+            if not get(label_key):
+                err[label_key] = "Label required."
+            value_type = get(type_key) or "field"
             row[type_key] = value_type
             if value_type == "text":
-                if not row.get(text_key):
-                    row_errors.setdefault(idx, {})[text_key] = "Text required."
-            else:
-                if not row.get(source_key):
-                    row_errors.setdefault(idx, {})[source_key] = "Source required."
+                if not get(text_key):
+                    err[text_key] = "Text required."
+            elif not get(source_key):
+                err[source_key] = "Source required."
             if value_type not in ("field", "text"):
-                row_errors.setdefault(idx, {})[type_key] = "Type must be 'field' or 'text'."
+                err[type_key] = "Type must be 'field' or 'text'."
+        if err:
+            row_errors[idx] = err
+            if not collect_all:
+                break
+            err = {}
     return row_errors
 
 
-def validate_report_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+def validate_report_profile(profile: Dict[str, Any], collect_all: bool = True) -> Dict[str, Any]:
     errors: Dict[str, Any] = {}
     summary_fields = profile.get("summary_fields", [])
     if not isinstance(summary_fields, list):
         errors["summary_fields"] = "Must be an array."
     else:
+        field_errors: Dict[int, str] = {}
         for idx, field in enumerate(summary_fields):
             if not isinstance(field, dict):
-                errors.setdefault("summary_fields", {})[idx] = "Each summary field must be an object."
+                field_errors[idx] = "Each summary field must be an object."
+            elif not field.get("source"):
+                field_errors[idx] = "Source is required."
+            elif not field.get("label"):
+                field_errors[idx] = "Label is required."
+            else:
                 continue
-            if not field.get("label"):
-                errors.setdefault("summary_fields", {})[idx] = "Label is required."
-            if not field.get("source"):
-                errors.setdefault("summary_fields", {})[idx] = "Source is required."
+            if not collect_all:
+                break
+        if field_errors:
+            errors["summary_fields"] = field_errors
+    if errors and not collect_all:
+        return errors
 
     deal_layouts = profile.get("deal_layouts", {})
     if not isinstance(deal_layouts, dict):
         errors["deal_layouts"] = "Must be an object."
     else:
+        layout_errors: Dict[str, Any] = {}
         for deal_name, layout in deal_layouts.items():
             if not isinstance(layout, dict):
-                errors.setdefault("deal_layouts", {})[deal_name] = "Layout must be an object."
-                continue
-            detail_rows = layout.get("detail_rows", [])
-            detail_errors = validate_detail_rows(detail_rows)
-            if isinstance(detail_errors, str):
-                errors.setdefault("deal_layouts", {})[deal_name] = {"detail_rows": detail_errors}
-            elif detail_errors:
-                errors.setdefault("deal_layouts", {})[deal_name] = {"detail_rows": detail_errors}
+                layout_errors[deal_name] = "Layout must be an object."
+            else:
+                detail_errors = validate_detail_rows(layout.get("detail_rows", []), collect_all)
+                if not detail_errors:
+                    continue
+                layout_errors[deal_name] = {"detail_rows": detail_errors}
+            if not collect_all:
+                break
+        if layout_errors:
+            errors["deal_layouts"] = layout_errors
 
     return errors
 
 
-def render_profile_preview(profile: Dict[str, Any], detail_rows: Any = None) -> str:
-    summary_fields = profile.get("summary_fields", [])
-    if detail_rows is None:
-        detail_rows = profile.get("detail_rows", [])
-
-    summary_header = "".join("<th>{}</th>".format(field.get("label", "")) for field in summary_fields)
-    summary_rows = "".join(
-        "<td>{{{{{}}}}}</td>".format(field.get("source", "")) for field in summary_fields
-    )
-    summary_html = (
-        "<table class='summary-table'>"
-        "<tr>{}</tr>"
-        "<tr>{}</tr>"
-        "</table>".format(summary_header or "<th>No Summary Fields</th>", summary_rows or "<td>—</td>")
-    )
-
-    detail_html_rows = []
-    if detail_rows:
-        for row in detail_rows:
-            left_value = row.get("left_text", "") if row.get("left_type") == "text" else "{{%s}}" % row.get("left_source", "")
-            right_value = row.get("right_text", "") if row.get("right_type") == "text" else "{{%s}}" % row.get("right_source", "")
-            detail_html_rows.append(
-                "<tr>"
-                "<th>{}</th><td>{}</td>"
-                "<th>{}</th><td>{}</td>"
-                "</tr>".format(
-                    row.get("left_label", ""),
-                    left_value or "—",
-                    row.get("right_label", ""),
-                    right_value or "—",
-                )
-            )
-    else:
-        detail_html_rows.append("<tr><td colspan='4'>No detail rows configured.</td></tr>")
-
-    detail_html = "<table class='detail-table'>{}</table>".format("".join(detail_html_rows))
-
-    return f"""<!doctype html>
+_PREVIEW_PREFIX = """<!doctype html>
 <html>
   <head>
     <meta charset="utf-8"/>
     <title>Report Preview</title>
     <style>
-      body {{ font-family: 'Segoe UI', Arial, sans-serif; background:#f5f7fb; color:#0f1a33; padding: 24px; }}
-      .summary-table, .detail-table {{
+      body { font-family: 'Segoe UI', Arial, sans-serif; background:#f5f7fb; color:#0f1a33; padding: 24px; }
+      .summary-table, .detail-table {
         width: 100%;
         border-collapse: collapse;
         background:#fff;
@@ -167,36 +211,84 @@ def render_profile_preview(profile: Dict[str, Any], detail_rows: Any = None) ->
         overflow: hidden;
         box-shadow:0 12px 30px rgba(15,42,99,0.08);
         margin-bottom: 32px;
-      }}
+      }
       .summary-table th, .summary-table td,
-      .detail-table th, .detail-table td {{
+      .detail-table th, .detail-table td {
         padding: 12px;
         border-bottom: 1px solid #eef2fb;
         text-align: left;
-      }}
-      .summary-table th, .detail-table th {{
+      }
+      .summary-table th, .detail-table th {
         background:#1a3bb5;
         color:#fff;
         text-transform: uppercase;
         letter-spacing: 0.05em;
         font-size: 0.8rem;
-      }}
-      .detail-table th {{
+      }
+      .detail-table th {
         width: 20%;
-      }}
-      .detail-table td {{
+      }
+      .detail-table td {
         font-weight: 600;
         color:#16255a;
-      }}
+      }
     </style>
   </head>
   <body>
     <h2>Summary Preview</h2>
-    {summary_html}
+    """
+_PREVIEW_MIDDLE = """
     <h2>Detail Preview</h2>
-    {detail_html}
+    """
+_PREVIEW_SUFFIX = """
   </body>
 </html>"""
+_PREVIEW_DETAIL_ROW = "<tr><th>%s</th><td>%s</td><th>%s</th><td>%s</td></tr>"
+
+
+def render_profile_preview(profile: Dict[str, Any], detail_rows: Any = None) -> str:
+    summary_fields = profile.get("summary_fields", [])
+    if detail_rows is None:
+        detail_rows = profile.get("detail_rows", [])
+
+    labels = list(map(html.escape, [str(field.get("label", "")) for field in summary_fields]))
+    sources = list(map(html.escape, [str(field.get("source", "")) for field in summary_fields]))
+    summary_header = "".join(["<th>" + label + "</th>" for label in labels])
+    summary_rows = "".join(["<td>{{" + source + "}}</td>" for source in sources])
+    summary_html = (
+        "<table class='summary-table'>"
+        "<tr>" + (summary_header or "<th>No Summary Fields</th>") + "</tr>"
+        "<tr>" + (summary_rows or "<td>—</td>") + "</tr>"
+        "</table>"
+    )
+
+    detail_html_rows = []
+    if detail_rows:
+        for row in detail_rows:
+            get = row.get
+            if get("left_type") == "text":
+                left_value = html.escape(str(get("left_text", "")))
+            else:
+                left_value = "{{" + html.escape(str(get("left_source", ""))) + "}}"
+            if get("right_type") == "text":
+                right_value = html.escape(str(get("right_text", "")))
+            else:
+                right_value = "{{" + html.escape(str(get("right_source", ""))) + "}}"
+            detail_html_rows.append(
+                _PREVIEW_DETAIL_ROW
+                % (
+                    html.escape(str(get("left_label", ""))),
+                    left_value or "—",
+                    html.escape(str(get("right_label", ""))),
+                    right_value or "—",
+                )
+            )
+    else:
+        detail_html_rows.append("<tr><td colspan='4'>No detail rows configured.</td></tr>")
+
+    detail_html = "<table class='detail-table'>" + "".join(detail_html_rows) + "</table>"
+
+    return _PREVIEW_PREFIX + summary_html + _PREVIEW_MIDDLE + detail_html + _PREVIEW_SUFFIX
 
 
 class ConfigValidationError(Exception):
@@ -205,7 +297,7 @@ class ConfigValidationError(Exception):
         self.errors = errors
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfigRepository:
     base_dir: Path
 
@@ -213,7 +305,7 @@ class ConfigRepository:
         name = name.strip()
         if not name:
             raise ValueError("Missing config name.")
-        if not NAME_PATTERN.fullmatch(name):
+        if not NAME_CHARS.issuperset(name):
             raise ValueError("Only letters, numbers, '.', '_' and '-' allowed in name.")
         return name
 
@@ -222,31 +314,38 @@ class ConfigRepository:
         return self.base_dir / f"{safe}.json"
 
     def list_configs(self) -> List[Dict[str, Any]]:
-        entries = []
-        for file in sorted(self.base_dir.glob("*.json")):
-            entries.append(
-                {
-                    "name": file.stem,
-                    "updated": datetime.fromtimestamp(file.stat().st_mtime).isoformat(),
-                    "size": file.stat().st_size,
-                }
-            )
-        return entries
+        with os.scandir(self.base_dir) as it:
+            rows = [(entry.name, entry.stat()) for entry in it if entry.name.endswith(".json") and entry.is_file()]
+        rows.sort()
+        return [
+            {
+                "name": name[:-5],
+                "updated": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                "size": stat.st_size,
+            }
+            for name, stat in rows
+        ]
 
     def load(self, name: str) -> Dict[str, Any]:
         path = self.path_for(name)
-        if not path.exists():
-            raise FileNotFoundError(f"Config '{name}' not found.")
-        with path.open("r", encoding="utf-8-sig") as handle:
-            data = json.load(handle)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Config '{name}' not found.") from None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = _CONFIG_CACHE.get(path)
+        if cached and cached[:2] == key:
+            return orjson.loads(cached[2])
+        data = _read_json(path)
         ensure_structure(data)
+        _CONFIG_CACHE[path] = (*key, orjson.dumps(data))
         return data
 
     def save(self, name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         path = self.path_for(name)
         ensure_structure(payload)
-        with path.open("w", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2)
+        _write_json(path, payload)
+        _CONFIG_CACHE.pop(path, None)
         return payload
 
 
@@ -275,6 +374,11 @@ def ensure_structure(document: Dict[str, Any]) -> None:
     document.setdefault("data_source", {"type": "", "regex": ""})
 
 
+@functools.lru_cache(maxsize=4096)
+def _formula_refs(formula: str) -> frozenset[str]:
+    return frozenset(match.group() for match in FORMULA_TOKEN.finditer(formula))
+
+
 def validate_document(document: Dict[str, Any]) -> Dict[str, Any]:
     errors: Dict[str, Any] = {}
     for header in ("spv", "file_pattern", "directory"):
@@ -288,21 +392,27 @@ def validate_document(document: Dict[str, Any]) -> Dict[str, Any]:
     calculated = fields.get("calculated_fields", {})
 
     def validate_cells(block: Dict[str, Any], label: str) -> None:
+        bucket = None
         for key, entry in block.items():
-            if not key.strip():
-                errors.setdefault(label, {})[key] = "Keys must not be empty."
+            # Checks run most-specific first; only one message is reported per key.
             if not isinstance(entry, dict):
-                errors.setdefault(label, {})[key] = "Must be an object with sheet/cell."
+                message = "Must be an object with sheet/cell."
+            elif not entry.get("cell", "").strip():
+                message = "Missing cell."
+            elif not entry.get("sheet", "").strip():
+                message = "Missing sheet."
+            elif not key.strip():
+                message = "Keys must not be empty."
+            else:
                 continue
-            if not entry.get("sheet", "").strip():
-                errors.setdefault(label, {})[key] = "Missing sheet."
-            if not entry.get("cell", "").strip():
-                errors.setdefault(label, {})[key] = "Missing cell."
+            if bucket is None:
+                bucket = errors.setdefault(label, {})
+            bucket[key] = message
 
     validate_cells(cell_references, "cell_references")
     validate_cells(variables, "variables")
 
-    available_formula_names = set(static_values.keys()) | set(variables.keys())
+    available_formula_names = {*static_values, *variables}
     for key, entry in calculated.items():
         if not isinstance(entry, dict):
             errors.setdefault("calculated_fields", {})[key] = "Must be an object."
@@ -311,8 +421,7 @@ def validate_document(document: Dict[str, Any]) -> Dict[str, Any]:
         if not formula:
             errors.setdefault("calculated_fields", {})[key] = "Formula is required."
             continue
-        referenced = set(FORMULA_TOKEN.findall(formula))
-        unknown = referenced - available_formula_names
+        unknown = _formula_refs(formula) - available_formula_names
         if unknown:
             errors.setdefault("calculated_fields", {})[key] = (
                 f"Unknown references: {', '.join(sorted(unknown))}"
@@ -330,11 +439,22 @@ def validate_document(document: Dict[str, Any]) -> Dict[str, Any]:
 repository = ConfigRepository(CONFIG_DIR)
 
 
+def read_config_payload() -> Dict[str, Any]:
+    if request.content_length and request.content_length > CONFIG_PAYLOAD_LIMIT:
+        raise RequestEntityTooLarge(f"Config payloads are limited to {CONFIG_PAYLOAD_LIMIT // 1024} KB.")
+    return request.get_json(force=True)
+
+
 @app.errorhandler(ConfigValidationError)
 def handle_validation_error(exc: ConfigValidationError):
     return jsonify({"error": "validation_error", "details": exc.errors}), 400
 
 
+@app.errorhandler(RequestEntityTooLarge)
+def handle_too_large(exc: RequestEntityTooLarge):
+    return jsonify({"error": "payload_too_large", "details": exc.description}), 413
+
+
 @app.errorhandler(FileNotFoundError)
 def handle_not_found(exc: FileNotFoundError):
     return jsonify({"error": "not_found", "details": str(exc)}), 404
@@ -347,7 +467,17 @@ def handle_value_error(exc: ValueError):
 
 @app.get("/api/configs")
 def list_configs():
-    return jsonify({"configs": repository.list_configs()})
+    # Scanned before the response starts so filesystem errors still reach the
+    # JSON error handlers; only the encoding is streamed.
+    entries = repository.list_configs()
+
+    def stream() -> Iterator[bytes]:
+        yield b'{"configs":['
+        for idx, entry in enumerate(entries):
+            yield (b"," if idx else b"") + orjson.dumps(entry)
+        yield b"]}"
+
+    return Response(stream(), mimetype="application/json")
 
 
 @app.get("/api/configs/<name>")
@@ -358,7 +488,10 @@ def get_config(name: str):
 
 @app.get("/api/report/profile")
 def get_report_profile():
-    return jsonify(REPORT_PROFILE)
+    global _REPORT_PROFILE_BYTES
+    if _REPORT_PROFILE_BYTES is None:
+        _REPORT_PROFILE_BYTES = orjson.dumps(REPORT_PROFILE, option=orjson.OPT_NON_STR_KEYS)
+    return Response(_REPORT_PROFILE_BYTES, mimetype="application/json")
 
 
 @app.put("/api/report/profile")
@@ -367,10 +500,11 @@ def update_report_profile():
     errors = validate_report_profile(payload)
     if errors:
         return jsonify({"error": "validation_error", "details": errors}), 400
-    REPORT_PROFILE_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-    global REPORT_PROFILE
+    _write_json(REPORT_PROFILE_PATH, payload)
+    global REPORT_PROFILE, _REPORT_PROFILE_BYTES
     REPORT_PROFILE = payload
-    return jsonify(REPORT_PROFILE)
+    _REPORT_PROFILE_BYTES = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return Response(_REPORT_PROFILE_BYTES, mimetype="application/json")
 
 
 @app.post("/api/report/visualize")
@@ -378,7 +512,7 @@ def visualize_report_profile():
     payload = request.get_json(force=True) or {}
     profile_data = payload.get("profile", payload)
     if "deal_layouts" in profile_data:
-        errors = validate_report_profile(profile_data)
+        errors = validate_report_profile(profile_data, collect_all=False)
         if errors:
             return jsonify({"error": "validation_error", "details": errors}), 400
         first_layout = next(iter(profile_data.get("deal_layouts", {}).values()), {})
@@ -389,7 +523,7 @@ def visualize_report_profile():
     if not isinstance(summary_fields, list):
         return jsonify({"error": "validation_error", "details": {"summary_fields": "Must be an array."}}), 400
     detail_rows = profile_data.get("detail_rows", [])
-    detail_errors = validate_detail_rows(detail_rows)
+    detail_errors = validate_detail_rows(detail_rows, collect_all=False)
     if isinstance(detail_errors, str):
         return jsonify({"error": "validation_error", "details": {"detail_rows": detail_errors}}), 400
     if detail_errors:
@@ -400,7 +534,7 @@ def visualize_report_profile():
 
 @app.post("/api/configs")
 def create_config():
-    payload = request.get_json(force=True)
+    payload = read_config_payload()
     name = payload.get("name", "")
     config = payload.get("config") or {}
     ensure_structure(config)
@@ -416,7 +550,7 @@ def create_config():
 
 @app.put("/api/configs/<name>")
 def update_config(name: str):
-    payload = request.get_json(force=True)
+    payload = read_config_payload()
     config = payload.get("config") or {}
     ensure_structure(config)
     errors = validate_document(config)
@@ -437,4 +571,13 @@ def report_builder():
 
 
 if __name__ == "__main__":
-    app.run(host="127.0.0.1", port=5050, debug=True)
+    if os.environ.get("DEBUG") == "1":
+        app.run(host="127.0.0.1", port=5050, debug=True)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            print("waitress is not installed; falling back to the threaded Flask dev server.")
+            app.run(host="127.0.0.1", port=5050, threaded=True)
+        else:
+            serve(app, host="127.0.0.1", port=5050, threads=8)
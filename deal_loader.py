@@ -1,25 +1,82 @@
 from __future__ import annotations
 
 import argparse
+import ast
+import functools
 import json
+import math
+import os
 import re
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, Final, Iterable, List, Tuple
 
 try:
     from openpyxl import Workbook, load_workbook
+    from openpyxl.cell.text import Text
+    from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+    from openpyxl.utils.cell import coordinate_to_tuple
+    from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+    from openpyxl.xml.constants import PKG_REL_NS, REL_NS, SHEET_MAIN_NS
+    from openpyxl.xml.functions import fromstring, iterparse
 except ImportError as exc:  # pragma: no cover
     raise SystemExit("Please install openpyxl to run the loader (pip install openpyxl).") from exc
 
 try:
-    import win32com.client as win32  # type: ignore
+    import orjson
 except ImportError:  # pragma: no cover
-    win32 = None
+    orjson = None
 
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # pragma: no cover
+    lxml_etree = None
+
+
+__all__ = [
+    "DealResult",
+    "DEFAULT_REPORT_PROFILE",
+    "Extractor",
+    "SUMMARY_METRICS",
+    "aggregate_values",
+    "build_extractor",
+    "business_date_location",
+    "compile_formula",
+    "compile_formulas",
+    "ensure_demo_workbook",
+    "evaluate_calculations",
+    "extract_blocks",
+    "extract_business_date",
+    "extract_cell",
+    "find_matching_files",
+    "format_business_date",
+    "format_value",
+    "load_configs",
+    "load_report_profile",
+    "main",
+    "open_outlook_draft",
+    "parse_args",
+    "parse_sheet_cell",
+    "process_all",
+    "plan_blocks",
+    "process_file",
+    "read_cells",
+    "read_json",
+    "read_plan",
+    "read_plan_fast",
+    "render_email",
+    "resolve_source",
+    "resolved_values",
+    "safe_number",
+    "sanitize_name",
+]
 
-@dataclass
+
+@dataclass(slots=True)
 class DealResult:
     spv: str
     config_name: str
@@ -55,6 +112,12 @@ def parse_args() -> argparse.Namespace:
         default="Deal Loader Report (Draft)",
         help="Subject line for the Outlook draft email.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes used to read workbooks in parallel (default: CPU count; 1 disables the pool).",
+    )
     parser.add_argument(
         "--report-profile",
         default="report_profile.json",
@@ -63,12 +126,26 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def read_json(path: Path) -> Any:
+    raw = path.read_bytes()
+    if raw.startswith(b"\xef\xbb\xbf"):
+        raw = raw[3:]
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def load_configs(config_dir: Path) -> List[Dict[str, Any]]:
     configs: List[Dict[str, Any]] = []
     for config_file in sorted(config_dir.glob("*.json")):
-        with config_file.open("r", encoding="utf-8-sig") as handle:
-            data = json.load(handle)
+        data = read_json(config_file)
         data["_file"] = config_file
+        try:
+            data["_extractor"] = build_extractor(data)
+        except Exception:
+            # Left to process_file, which rebuilds it inside the per-file
+            # error handling so one bad config does not stop the run.
+            pass
         configs.append(data)
     if not configs:
         raise FileNotFoundError(f"No configs found in {config_dir}")
@@ -127,23 +204,40 @@ DEFAULT_REPORT_PROFILE = {
 
 
 def load_report_profile(path: Path) -> Dict[str, Any]:
-    if path.exists():
-        with path.open("r", encoding="utf-8-sig") as handle:
-            return json.load(handle)
-    return DEFAULT_REPORT_PROFILE
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return DEFAULT_REPORT_PROFILE
+    return _load_report_profile_cached(path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_report_profile_cached(path: Path, _mtime_ns: int) -> Dict[str, Any]:
+    # Keyed on mtime so an edited profile is re-read; callers treat the result as read-only.
+    return read_json(path)
+
 
+_SANITIZE_RE = re.compile(r"[^A-Za-z0-9]+")
 
+
+@functools.lru_cache(maxsize=256)
+def _compiled(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+@functools.lru_cache(maxsize=256)
 def sanitize_name(value: str) -> str:
-    return re.sub(r"[^A-Za-z0-9]+", "_", value).strip("_").lower() or "deal"
+    return _SANITIZE_RE.sub("_", value).strip("_").lower() or "deal"
 
 
 def ensure_demo_workbook(config: Dict[str, Any], sample_dir: Path, force: bool = False) -> Path:
-    sample_dir.mkdir(parents=True, exist_ok=True)
     filename = f"{sanitize_name(config['spv'])}_demo.xlsx"
     destination = sample_dir / filename
-    if destination.exists() and not force:
+    if not force and destination.exists():
         return destination
 
+    sample_dir.mkdir(parents=True, exist_ok=True)
+
     wb = Workbook()
     ws = wb.active
     ws.title = "Capital Structure"
@@ -164,8 +258,19 @@ def ensure_demo_workbook(config: Dict[str, Any], sample_dir: Path, force: bool =
 
 def find_matching_files(config: Dict[str, Any], search_dir: Path) -> List[Path]:
     pattern = config.get("file_pattern", "")
-    regex = re.compile(pattern)
-    return [path for path in search_dir.glob("*.xlsx") if regex.search(path.name)]
+    search = _compiled(pattern).search if pattern else None
+    try:
+        with os.scandir(search_dir) as entries:
+            names = [
+                entry.name
+                for entry in entries
+                if os.path.normcase(entry.name).endswith(".xlsx")
+                and entry.is_file()
+                and (search is None or search(entry.name))
+            ]
+    except FileNotFoundError:
+        return []
+    return [search_dir / name for name in names]
 
 
 def parse_sheet_cell(value: str) -> Tuple[str, str]:
@@ -182,66 +287,396 @@ def extract_cell(workbook, sheet: str, cell: str):
     return ws[cell].value
 
 
+def read_cells(ws, cells: Iterable[str]) -> Dict[str, Any]:
+    # Read-only worksheets re-scan the sheet XML on every ws[cell] lookup, so read
+    # the bounding box of all wanted cells with a single iter_rows pass instead.
+    coords = {cell: coordinate_to_tuple(cell) for cell in cells}
+    if not coords:
+        return {}
+    min_row = min(row for row, _ in coords.values())
+    max_row = max(row for row, _ in coords.values())
+    min_col = min(col for _, col in coords.values())
+    max_col = max(col for _, col in coords.values())
+    grid = list(
+        ws.iter_rows(
+            min_row=min_row,
+            max_row=max_row,
+            min_col=min_col,
+            max_col=max_col,
+            values_only=True,
+        )
+    )
+    values: Dict[str, Any] = {}
+    for cell, (row, col) in coords.items():
+        r, c = row - min_row, col - min_col
+        values[cell] = grid[r][c] if r < len(grid) and c < len(grid[r]) else None
+    return values
+
+
+SheetPlan = Tuple[Tuple[str, frozenset, Tuple[Tuple[int, str, str], ...]], ...]
+BlockPlan = Tuple[Tuple[Tuple[str, ...], ...], SheetPlan]
+
+
+def plan_blocks(*blocks: Dict[str, Any]) -> BlockPlan:
+    # Resolve block definitions into (names per block, per-sheet cell lists) once,
+    # so repeated reads with the same config skip walking the config dicts.
+    names: List[Tuple[str, ...]] = []
+    wanted: Dict[str, List[Tuple[int, str, str]]] = {}
+    for index, block in enumerate(blocks):
+        block_names: List[str] = []
+        for name, location in block.items():
+            sheet = location.get("sheet", "")
+            cell = location.get("cell", "")
+            if sheet and cell:
+                name = sys.intern(name)
+                block_names.append(name)
+                wanted.setdefault(sheet, []).append((index, name, cell))
+        names.append(tuple(block_names))
+    sheets = tuple(
+        (sheet, frozenset(cell for _, _, cell in entries), tuple(entries))
+        for sheet, entries in wanted.items()
+    )
+    return tuple(names), sheets
+
+
+def _fill_plan(plan: BlockPlan, values_by_sheet: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    names, sheets = plan
+    results = [dict.fromkeys(block_names) for block_names in names]
+    for sheet, _, entries in sheets:
+        sheet_values = values_by_sheet[sheet]
+        for index, name, cell in entries:
+            results[index][name] = sheet_values[cell]
+    return results
+
+
+def read_plan(workbook, plan: BlockPlan) -> List[Dict[str, Any]]:
+    # One dict per block, in config order; every sheet is read once.
+    sheetnames = set(workbook.sheetnames)
+    values_by_sheet: Dict[str, Dict[str, Any]] = {}
+    for sheet, cells, _ in plan[1]:
+        if sheet not in sheetnames:
+            raise ValueError(f"Sheet '{sheet}' not found in {workbook.sheetnames}")
+        values_by_sheet[sheet] = read_cells(workbook[sheet], cells)
+    return _fill_plan(plan, values_by_sheet)
+
+
+# Fast path: read the wanted cells straight from the .xlsx archive. Only the
+# worksheet parts that hold them are parsed, each up to the last wanted cell;
+# shared strings and number formats are only read when a wanted cell needs them.
+# Anything unusual returns None and the caller falls back to openpyxl.
+_CELL_TAG: Final = f"{{{SHEET_MAIN_NS}}}c"
+_VALUE_TAG: Final = f"{{{SHEET_MAIN_NS}}}v"
+_INLINE_STRING_TAG: Final = f"{{{SHEET_MAIN_NS}}}is"
+_SHARED_STRING_TAG: Final = f"{{{SHEET_MAIN_NS}}}si"
+
+RawCell = Tuple[str, int, Any]
+
+
+def _iter_elements(source, tag: str):
+    # lxml filters on the tag in C; the stdlib parser yields every element.
+    if lxml_etree is not None:
+        for _, element in lxml_etree.iterparse(source, tag=tag, resolve_entities=False):
+            yield element
+            element.clear()
+        return
+    for _, element in iterparse(source):
+        if element.tag == tag:
+            yield element
+            element.clear()
+
+
+def _workbook_parts(archive: zipfile.ZipFile) -> Tuple[Dict[str, str], str | None, bool]:
+    # Sheet name -> worksheet part, the shared strings part and the 1904 flag.
+    workbook = fromstring(archive.read("xl/workbook.xml"))
+    rels = fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets: Dict[str, str] = {}
+    shared_strings = None
+    for rel in rels.iter(f"{{{PKG_REL_NS}}}Relationship"):
+        target = rel.get("Target", "")
+        target = target[1:] if target.startswith("/") else f"xl/{target}"
+        targets[rel.get("Id")] = target
+        if rel.get("Type", "").endswith("/sharedStrings"):
+            shared_strings = target
+    parts = {
+        sheet.get("name"): targets[sheet.get(f"{{{REL_NS}}}id")]
+        for sheet in workbook.iter(f"{{{SHEET_MAIN_NS}}}sheet")
+    }
+    properties = workbook.find(f"{{{SHEET_MAIN_NS}}}workbookPr")
+    date1904 = properties is not None and properties.get("date1904", "").lower() in ("1", "true")
+    return parts, shared_strings, date1904
+
+
+def _scan_sheet(archive: zipfile.ZipFile, part: str, positions: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], RawCell]:
+    wanted = set(positions)
+    max_row = max(row for row, _ in wanted)
+    found: Dict[Tuple[int, int], RawCell] = {}
+    with archive.open(part) as source:
+        for element in _iter_elements(source, _CELL_TAG):
+            position = coordinate_to_tuple(element.get("r"))
+            if position[0] > max_row:
+                break
+            if position not in wanted:
+                continue
+            data_type = element.get("t", "n")
+            if data_type == "inlineStr":
+                child = element.find(_INLINE_STRING_TAG)
+                value = None if child is None else Text.from_tree(child).content
+            else:
+                value = element.findtext(_VALUE_TAG, None) or None
+            found[position] = (data_type, int(element.get("s", 0) or 0), value)
+            if len(found) == len(wanted):
+                break
+    return found
+
+
+def _shared_strings(archive: zipfile.ZipFile, part: str, indexes: Iterable[int]) -> Dict[int, str]:
+    wanted = set(indexes)
+    last = max(wanted)
+    strings: Dict[int, str] = {}
+    with archive.open(part) as source:
+        for index, element in enumerate(_iter_elements(source, _SHARED_STRING_TAG)):
+            if index in wanted:
+                strings[index] = Text.from_tree(element).content.replace("x005F_", "")
+            if index >= last:
+                break
+    return strings
+
+
+def _date_styles(archive: zipfile.ZipFile) -> Tuple[frozenset, frozenset]:
+    # Indexes of cellXfs entries whose number format is a date or a duration.
+    try:
+        styles = fromstring(archive.read("xl/styles.xml"))
+    except KeyError:
+        return frozenset(), frozenset()
+    custom: Dict[int, str] = {}
+    num_fmts = styles.find(f"{{{SHEET_MAIN_NS}}}numFmts")
+    if num_fmts is not None:
+        for num_fmt in num_fmts:
+            custom[int(num_fmt.get("numFmtId"))] = num_fmt.get("formatCode")
+    date_styles, timedelta_styles = set(), set()
+    cell_xfs = styles.find(f"{{{SHEET_MAIN_NS}}}cellXfs")
+    for index, xf in enumerate(() if cell_xfs is None else cell_xfs):
+        num_fmt_id = int(xf.get("numFmtId", 0))
+        fmt = custom[num_fmt_id] if num_fmt_id in custom else builtin_format_code(num_fmt_id)
+        if is_date_format(fmt):
+            date_styles.add(index)
+        if is_timedelta_format(fmt):
+            timedelta_styles.add(index)
+    return frozenset(date_styles), frozenset(timedelta_styles)
+
+
+def _cell_value(raw: RawCell | None, strings: Dict[int, str], date_styles: frozenset, timedelta_styles: frozenset, epoch) -> Any:
+    # Same conversions as openpyxl's read-only worksheet reader with data_only=True.
+    if raw is None:
+        return None
+    data_type, style, value = raw
+    if value is None:
+        return None
+    if data_type == "n":
+        number = float(value) if "." in value or "E" in value or "e" in value else int(value)
+        if style in date_styles:
+            return from_excel(number, epoch, timedelta=style in timedelta_styles)
+        return number
+    if data_type == "s":
+        return strings[int(value)]
+    if data_type == "b":
+        return bool(int(value))
+    if data_type == "d":
+        return from_ISO8601(value)
+    return value
+
+
+def read_plan_fast(workbook_path: Path, plan: BlockPlan) -> List[Dict[str, Any]] | None:
+    try:
+        with zipfile.ZipFile(workbook_path) as archive:
+            parts, strings_part, date1904 = _workbook_parts(archive)
+            raw_by_sheet: Dict[str, Dict[str, RawCell | None]] = {}
+            for sheet, cells, _ in plan[1]:
+                positions = {cell: coordinate_to_tuple(cell) for cell in cells}
+                found = _scan_sheet(archive, parts[sheet], positions.values())
+                raw_by_sheet[sheet] = {cell: found.get(position) for cell, position in positions.items()}
+
+            raw_cells = [raw for values in raw_by_sheet.values() for raw in values.values() if raw and raw[2] is not None]
+            indexes = [int(raw[2]) for raw in raw_cells if raw[0] == "s"]
+            strings = _shared_strings(archive, strings_part, indexes) if indexes else {}
+            if any(raw[0] == "n" for raw in raw_cells):
+                date_styles, timedelta_styles = _date_styles(archive)
+            else:
+                date_styles = timedelta_styles = frozenset()
+        epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+        values_by_sheet = {
+            sheet: {
+                cell: _cell_value(raw, strings, date_styles, timedelta_styles, epoch)
+                for cell, raw in values.items()
+            }
+            for sheet, values in raw_by_sheet.items()
+        }
+    except Exception:
+        return None
+    return _fill_plan(plan, values_by_sheet)
+
+
+def extract_blocks(workbook, *blocks: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return read_plan(workbook, plan_blocks(*blocks))
+
+
+_NUMBER_STRIP = str.maketrans("", "", ",")
+
+
 def safe_number(value: Any) -> float:
+    # Exact type checks first: floats and ints from openpyxl are the common case.
+    kind = type(value)
+    if kind is float:
+        return value
+    if kind is int:
+        return float(value)
     if value is None:
         return 0.0
     if isinstance(value, (int, float)):
         return float(value)
     try:
-        return float(str(value).replace(",", ""))
+        return float((value if kind is str else str(value)).translate(_NUMBER_STRIP))
     except ValueError:
         return 0.0
 
 
+def _syntax_error(exc: SyntaxError) -> Callable[..., Any]:
+    def fail(*_args: float) -> Any:
+        raise SyntaxError(*exc.args)
+
+    return fail
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_formula(formula: str) -> Tuple[Tuple[str, ...], Callable[..., Any]]:
+    # Turn "a / b" into (("a", "b"), lambda a, b: a / b) so callers pass coerced
+    # inputs positionally instead of building a locals dict per evaluation.
+    try:
+        tree = ast.parse(formula.strip(), filename="<string>", mode="eval")
+    except SyntaxError as exc:
+        return (), _syntax_error(exc)
+    # Only free names become parameters; comprehension targets, lambda
+    # arguments and := targets are bound inside the formula itself.
+    bound = {node.arg for node in ast.walk(tree) if isinstance(node, ast.arg)}
+    bound.update(node.id for node in ast.walk(tree) if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load))
+    names = tuple(
+        dict.fromkeys(
+            node.id
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) and node.id not in bound
+        )
+    )
+    params = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=name) for name in names],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+    expression = ast.fix_missing_locations(ast.Expression(body=ast.Lambda(args=params, body=tree.body)))
+    code = compile(expression, "<formula>", "eval")
+    return names, eval(code, {"__builtins__": {}})  # noqa: S307 - controlled input from configs
+
+
+def compile_formulas(config: Dict[str, Any]) -> None:
+    # Warm the compile cache at load time. The closures stay out of the config
+    # itself so configs remain picklable for the worker pool.
+    for spec in config.get("fields", {}).get("calculated_fields", {}).values():
+        compile_formula(spec.get("formula", ""))
+
+
 def evaluate_calculations(calculated: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
     results: Dict[str, Any] = {}
-    safe_locals = {key: safe_number(val) for key, val in context.items()}
+    inputs: Dict[str, float] = {}
     for key, spec in calculated.items():
-        formula = spec.get("formula", "")
+        names, formula = compile_formula(spec.get("formula", ""))
         try:
-            value = eval(  # noqa: S307 - controlled input from configs
-                formula,
-                {"__builtins__": {}},
-                safe_locals,
-            )
+            args = []
+            for name in names:
+                value = inputs.get(name)
+                if value is None:
+                    if name not in context:
+                        raise NameError(f"name '{name}' is not defined")
+                    value = inputs[name] = safe_number(context[name])
+                args.append(value)
+            value = formula(*args)
         except Exception as exc:
             value = f"Error: {exc}"
         results[key] = value
     return results
 
 
-def process_file(config: Dict[str, Any], workbook_path: Path) -> DealResult:
-    wb = load_workbook(workbook_path, data_only=True)
-    static_values = config["fields"].get("static_values", {}).copy()
-
-    cell_values: Dict[str, Any] = {}
-    for name, location in config["fields"].get("cell_references", {}).items():
-        sheet = location.get("sheet", "")
-        cell = location.get("cell", "")
-        if sheet and cell:
-            cell_values[name] = extract_cell(wb, sheet, cell)
-
-    variable_values: Dict[str, Any] = {}
-    for name, location in config["fields"].get("variables", {}).items():
-        sheet = location.get("sheet", "")
-        cell = location.get("cell", "")
-        if sheet and cell:
-            variable_values[name] = extract_cell(wb, sheet, cell)
-
-    calculation_context = {**static_values, **cell_values, **variable_values}
-    calculated_values = evaluate_calculations(
-        config["fields"].get("calculated_fields", {}),
-        calculation_context,
-    )
+def business_date_location(config: Dict[str, Any]) -> Tuple[str, str] | None:
+    ds = config.get("data_source", {})
+    if ds.get("type", "filename") == "cell_reference" and ds.get("regex", ""):
+        return parse_sheet_cell(ds["regex"])
+    return None
 
-    business_date = extract_business_date(config, workbook_path, wb)
 
-    combined_values = {
-        **static_values,
-        **cell_values,
-        **variable_values,
-        **calculated_values,
-    }
+@dataclass(frozen=True, slots=True)
+class Extractor:
+    spv: str
+    config_name: str
+    data_source: Dict[str, Any]
+    date_mode: str  # "filename", "cell" or "workbook"
+    plan: BlockPlan
+    static_values: Dict[str, Any]
+    calculated_fields: Dict[str, Any]
+
+    def __call__(self, workbook_path: Path) -> DealResult:
+        if self.date_mode == "filename":
+            business_date = extract_business_date({"data_source": self.data_source}, workbook_path, None)
+
+        blocks = read_plan_fast(workbook_path, self.plan) if self.date_mode != "workbook" else None
+        if blocks is None:
+            wb = load_workbook(workbook_path, read_only=True, data_only=True, keep_links=False)
+            try:
+                blocks = read_plan(wb, self.plan)
+                if self.date_mode == "workbook":
+                    business_date = extract_business_date({"data_source": self.data_source}, workbook_path, wb)
+            finally:
+                wb.close()
+        cell_values, variable_values, date_values = blocks
+        if self.date_mode == "cell":
+            business_date = format_business_date(date_values["business_date"])
+
+        # Results share the config's static values; nothing downstream mutates them.
+        static_values = self.static_values
+        combined_values = dict(static_values)
+        combined_values.update(cell_values)
+        combined_values.update(variable_values)
+        # Before the calculated fields are merged in, combined_values is exactly
+        # the context the formulas evaluate against.
+        calculated_values = evaluate_calculations(self.calculated_fields, combined_values)
+        combined_values.update(calculated_values)
+        return DealResult(
+            spv=self.spv,
+            config_name=self.config_name,
+            file_path=workbook_path,
+            business_date=business_date,
+            static_values=static_values,
+            cell_values=cell_values,
+            calculated_fields=calculated_values,
+            combined_values=combined_values,
+        )
+
+
+def build_extractor(config: Dict[str, Any]) -> Extractor:
+    # Everything that depends only on the config is resolved here, once per
+    # config; the extractor is plain data so it pickles into the worker pool.
+    fields = config["fields"]
+    # Filename-based dates need nothing from the workbook; cell-based dates are
+    # read in the same per-sheet pass as the other cells.
+    date_location = business_date_location(config)
+    date_block: Dict[str, Any] = {}
+    if date_location is None:
+        date_mode = "filename"
+    elif all(date_location):
+        date_mode = "cell"
+        date_block = {"business_date": {"sheet": date_location[0], "cell": date_location[1]}}
+    else:
+        date_mode = "workbook"
+
     config_name = config.get("_file")
     if isinstance(config_name, Path):
         config_name = config_name.stem
@@ -250,31 +685,39 @@ def process_file(config: Dict[str, Any], workbook_path: Path) -> DealResult:
     else:
         config_name = config.get("spv", "deal")
 
-    return DealResult(
+    compile_formulas(config)
+    return Extractor(
         spv=config["spv"],
         config_name=config_name,
-        file_path=workbook_path,
-        business_date=business_date,
-        static_values=static_values,
-        cell_values=cell_values,
-        calculated_fields=calculated_values,
-        combined_values=combined_values,
+        data_source=config.get("data_source", {}),
+        date_mode=date_mode,
+        plan=plan_blocks(fields.get("cell_references", {}), fields.get("variables", {}), date_block),
+        # Interned keys are shared by every result dict of every config.
+        static_values={sys.intern(key): value for key, value in fields.get("static_values", {}).items()},
+        calculated_fields={sys.intern(key): spec for key, spec in fields.get("calculated_fields", {}).items()},
     )
 
 
+def process_file(config: Dict[str, Any], workbook_path: Path) -> DealResult:
+    extractor = config.get("_extractor") or build_extractor(config)
+    return extractor(workbook_path)
+
+
+def format_business_date(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
 def extract_business_date(config: Dict[str, Any], workbook_path: Path, workbook) -> str:
     ds = config.get("data_source", {})
     source_type = ds.get("type", "filename")
     pattern = ds.get("regex", "")
     if source_type == "cell_reference" and pattern:
         sheet, cell = parse_sheet_cell(pattern)
-        value = extract_cell(workbook, sheet, cell)
-        if isinstance(value, datetime):
-            return value.strftime("%Y-%m-%d")
-        return str(value)
+        return format_business_date(extract_cell(workbook, sheet, cell))
     if pattern:
-        regex = re.compile(pattern)
-        match = regex.search(workbook_path.name)
+        match = _compiled(pattern).search(workbook_path.name)
         if match:
             return match.group(0)
     return datetime.now().strftime("%Y-%m-%d")
@@ -289,12 +732,6 @@ SUMMARY_METRICS = [
 ]
 
 
-def format_value(value: Any) -> str:
-    if isinstance(value, (int, float)):
-        return f"{value:,.2f}"
-    return str(value)
-
-
 def resolve_source(result: DealResult, source: str) -> Any:
     if source == "@spv":
         return result.spv
@@ -305,7 +742,25 @@ def resolve_source(result: DealResult, source: str) -> Any:
     return result.combined_values.get(source)
 
 
+def resolved_values(result: DealResult) -> Dict[str, Any]:
+    # Flat lookup table equivalent to resolve_source for every source of one result.
+    values = dict(result.combined_values)
+    values["@spv"] = result.spv
+    values["@file"] = result.file_path.name
+    values["@business_date"] = result.business_date
+    return values
+
+
 def format_value(value: Any, fmt: str | None = None) -> str:
+    # Reports repeat the same values (zeros, dates, shared statics) across many
+    # cells, so formatted strings are memoised; unhashable values skip the cache.
+    try:
+        return _format_value_cached(value, fmt or "")
+    except TypeError:
+        return _format_value(value, fmt)
+
+
+def _format_value(value: Any, fmt: str | None) -> str:
     if value in (None, "", "—"):
         return "—"
     if fmt == "currency":
@@ -317,6 +772,48 @@ def format_value(value: Any, fmt: str | None = None) -> str:
     return str(value)
 
 
+# typed=True keeps 1, 1.0 and True from sharing a cache entry.
+_format_value_cached = functools.lru_cache(maxsize=4096, typed=True)(_format_value)
+
+
+_STYLE_BLOCK: Final[str] = """\
+<style>
+    body { font-family: 'Segoe UI', Arial, sans-serif; background:#f5f7fb; color:#0f1a33; }
+    .wrapper { max-width: 960px; margin: 0 auto; padding: 20px; }
+    .summary-table { width:100%; border-collapse: collapse; margin-bottom: 32px; background:#fff; border-radius: 16px; overflow:hidden; box-shadow:0 8px 24px rgba(15,42,99,0.08); }
+    .summary-table th { background:#1a3bb5; color:#fff; padding:10px; text-align:left; }
+    .summary-table td { padding:10px; border-bottom:1px solid #eef2fb; }
+    .summary-table .total-row td { background:#f0f3ff; font-weight:600; }
+    .deal-card { background:#fff; border-radius: 16px; padding: 20px; margin-bottom: 18px; box-shadow:0 8px 24px rgba(15,42,99,0.08); }
+    .deal-header { display:flex; justify-content:space-between; align-items:flex-start; margin-bottom:12px; }
+    .deal-header h3 { margin:0; }
+    .deal-header p { margin:4px 0 0; color:#5a6b8c; }
+    .detail-grid { width:100%; border-collapse: collapse; margin-top:10px; }
+    .detail-grid th { background:#f5f7ff; text-transform:uppercase; font-size:0.75rem; letter-spacing:0.05em; padding:8px; color:#4d6090; }
+    .detail-grid td { padding:8px; border-bottom:1px solid #eef2fb; font-weight:600; color:#16255a; }
+</style>
+"""
+_HTML_ESCAPE_TABLE: Final = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_NUMERIC_FORMATS: Final = frozenset({"currency", "number", "percentage"})
+
+
+def _escape(value: Any) -> str:
+    return str(value).translate(_HTML_ESCAPE_TABLE)
+
+
+_SUMMARY_HEADING: Final[str] = "<h2>Deal Summary</h2>"
+_DETAILS_HEADING: Final[str] = "<h2>Deal Details</h2>"
+_DEAL_CARD_OPEN: Final[str] = (
+    "<div class='deal-card'>"
+    "<div class='deal-header'>"
+    "<div><h3>{spv}</h3></div>"
+    "<div class='deal-date'><strong>As of:</strong> {business_date}</div>"
+    "</div>"
+    "<table class='detail-grid'>"
+)
+_DEAL_CARD_CLOSE: Final[str] = "</table></div>"
+
+
 def aggregate_values(values: List[float], method: str) -> float | None:
     if not values:
         return None
@@ -333,15 +830,47 @@ def render_email(results: List[DealResult], profile: Dict[str, Any]) -> str:
     if not results:
         return "<p>No deals were processed.</p>"
 
+    _format_value_cached.cache_clear()
+    resolved = [resolved_values(result) for result in results]
     summary_columns = profile.get("summary_fields", [])
-    summary_rows = []
-    for result in results:
-        cells = []
-        for column in summary_columns:
-            value = resolve_source(result, column.get("source", ""))
-            display = format_value(value, column.get("format"))
-            cells.append(f"<td>{display}</td>")
-        summary_rows.append("<tr>" + "".join(cells) + "</tr>")
+    parts: List[str] = [_STYLE_BLOCK, '<div class="wrapper">', _SUMMARY_HEADING, "<table class='summary-table'>", "<tr>"]
+    for column in summary_columns:
+        parts.append("<th>" + _escape(column.get("label")) + "</th>")
+    parts.append("</tr>")
+    # Numeric formats only ever produce digits, separators and '%', so they skip escaping.
+    cell_specs = [
+        (column.get("source", ""), column.get("format"), column.get("format") in _NUMERIC_FORMATS)
+        for column in summary_columns
+    ]
+    for values in resolved:
+        parts.append("<tr>")
+        for source, fmt, numeric in cell_specs:
+            display = format_value(values.get(source), fmt)
+            parts.append("<td>" + (display if numeric else display.translate(_HTML_ESCAPE_TABLE)) + "</td>")
+        parts.append("</tr>")
+
+    # Resolve every aggregated source once per result into columnar lists, then
+    # compute all aggregates from those lists instead of re-walking results.
+    aggregate_sources: Dict[str, None] = {}
+    for column in summary_columns:
+        aggregate_method = column.get("aggregate")
+        if not aggregate_method:
+            continue
+        source = column.get("source", "")
+        if aggregate_method == "ratio":
+            aggregate_sources[column.get("numerator") or source] = None
+            if column.get("denominator"):
+                aggregate_sources[column["denominator"]] = None
+        else:
+            aggregate_sources[source] = None
+    raw_columns: Dict[str, List[Any]] = {source: [] for source in aggregate_sources}
+    for values in resolved:
+        for source, column_values in raw_columns.items():
+            column_values.append(values.get(source))
+    to_number = safe_number
+    numeric_columns = {
+        source: [to_number(value) for value in values] for source, values in raw_columns.items()
+    }
 
     totals_map: Dict[str, Any] = {}
     for column in summary_columns:
@@ -350,62 +879,50 @@ def render_email(results: List[DealResult], profile: Dict[str, Any]) -> str:
             continue
         source = column.get("source", "")
         if aggregate_method == "sum":
-            totals_map[source] = sum(
-                safe_number(resolve_source(result, source)) for result in results
-            )
+            totals_map[source] = math.fsum(numeric_columns[source])
         elif aggregate_method == "ratio":
-            numerator_field = column.get("numerator") or source
+            numerator = math.fsum(numeric_columns[column.get("numerator") or source])
             denominator_field = column.get("denominator")
-            numerator = sum(safe_number(resolve_source(result, numerator_field)) for result in results)
-            denominator = sum(
-                safe_number(resolve_source(result, denominator_field)) for result in results
-            ) if denominator_field else 0
+            denominator = math.fsum(numeric_columns[denominator_field]) if denominator_field else 0
             totals_map[source] = numerator / denominator if denominator else None
         elif aggregate_method == "average":
             values = [
-                safe_number(resolve_source(result, source))
-                for result in results
-                if resolve_source(result, source) not in (None, "", "—")
+                number
+                for raw, number in zip(raw_columns[source], numeric_columns[source])
+                if raw not in (None, "", "—")
             ]
-            totals_map[source] = (sum(values) / len(values)) if values else None
+            totals_map[source] = (math.fsum(values) / len(values)) if values else None
         elif aggregate_method == "max":
-            totals_map[source] = max(
-                safe_number(resolve_source(result, source)) for result in results
-            )
+            totals_map[source] = max(numeric_columns[source])
         elif aggregate_method == "min":
-            totals_map[source] = min(
-                safe_number(resolve_source(result, source)) for result in results
-            )
+            totals_map[source] = min(numeric_columns[source])
 
-    total_row_cells = []
+    parts.append("<tr class='total-row'>")
     for idx, column in enumerate(summary_columns):
         if idx == 0:
-            total_row_cells.append("<td><strong>TOTAL</strong></td>")
+            parts.append("<td><strong>TOTAL</strong></td>")
             continue
         column_source = column.get("source", "")
         aggregate_value = totals_map.get(column_source)
         display = format_value(aggregate_value, column.get("format")) if aggregate_value is not None else ""
-        total_row_cells.append(f"<td class='total-cell'>{display}</td>")
-
-    summary_table = [
-        "<table class='summary-table'>",
-        "<tr>" + "".join(f"<th>{column.get('label')}</th>" for column in summary_columns) + "</tr>",
-        *summary_rows,
-        "<tr class='total-row'>" + "".join(total_row_cells) + "</tr>",
-        "</table>",
-    ]
+        parts.append("<td class='total-cell'>" + _escape(display) + "</td>")
+    parts.append("</tr></table>")
 
     # Detail sections per deal
-    detail_sections = []
+    parts.append(_DETAILS_HEADING)
     layout_map = profile.get("deal_layouts", {})
     default_detail_rows = profile.get("detail_rows") or profile.get("detail_defaults") or []
-    for result in results:
-        rows_html = []
+    for result, values in zip(results, resolved):
         detail_rows = []
         if isinstance(layout_map, dict):
             detail_rows = (layout_map.get(result.config_name) or {}).get("detail_rows", [])
         if not detail_rows:
             detail_rows = default_detail_rows
+        parts.append(
+            _DEAL_CARD_OPEN.format_map(
+                {"spv": _escape(result.spv), "business_date": _escape(result.business_date)}
+            )
+        )
         if detail_rows:
             for row in detail_rows:
                 left_label = row.get("left_label", "")
@@ -414,7 +931,7 @@ def render_email(results: List[DealResult], profile: Dict[str, Any]) -> str:
                 left_value = (
                     row.get("left_text", "")
                     if left_type == "text"
-                    else format_value(resolve_source(result, left_source))
+                    else format_value(values.get(left_source))
                 )
                 right_label = row.get("right_label", "")
                 right_type = row.get("right_type") or "field"
@@ -422,58 +939,35 @@ def render_email(results: List[DealResult], profile: Dict[str, Any]) -> str:
                 right_value = (
                     row.get("right_text", "")
                     if right_type == "text"
-                    else format_value(resolve_source(result, right_source))
+                    else format_value(values.get(right_source))
                 )
-                rows_html.append(
+                parts.append(
                     "<tr>"
-                    f"<th>{left_label}</th><td>{left_value or '—'}</td>"
-                    f"<th>{right_label}</th><td>{right_value or '—'}</td>"
+                    f"<th>{_escape(left_label)}</th><td>{_escape(left_value) or '—'}</td>"
+                    f"<th>{_escape(right_label)}</th><td>{_escape(right_value) or '—'}</td>"
                     "</tr>"
                 )
         else:
-            rows_html.append("<tr><td colspan='4'>No detail rows configured.</td></tr>")
-
-        detail_sections.append(
-            f"""
-            <div class='deal-card'>
-                <div class='deal-header'>
-                    <div><h3>{result.spv}</h3></div>
-                    <div class='deal-date'><strong>As of:</strong> {result.business_date}</div>
-                </div>
-                <table class='detail-grid'>
-                    {''.join(rows_html)}
-                </table>
-            </div>
-            """
-        )
+            parts.append("<tr><td colspan='4'>No detail rows configured.</td></tr>")
+        parts.append(_DEAL_CARD_CLOSE)
+
+    parts.append("</div>")
+    return "".join(parts)
 
-    html = f"""
-    <style>
-        body {{ font-family: 'Segoe UI', Arial, sans-serif; background:#f5f7fb; color:#0f1a33; }}
-        .wrapper {{ max-width: 960px; margin: 0 auto; padding: 20px; }}
-        .summary-table {{ width:100%; border-collapse: collapse; margin-bottom: 32px; background:#fff; border-radius: 16px; overflow:hidden; box-shadow:0 8px 24px rgba(15,42,99,0.08); }}
-        .summary-table th {{ background:#1a3bb5; color:#fff; padding:10px; text-align:left; }}
-        .summary-table td {{ padding:10px; border-bottom:1px solid #eef2fb; }}
-        .summary-table .total-row td {{ background:#f0f3ff; font-weight:600; }}
-        .deal-card {{ background:#fff; border-radius: 16px; padding: 20px; margin-bottom: 18px; box-shadow:0 8px 24px rgba(15,42,99,0.08); }}
-        .deal-header {{ display:flex; justify-content:space-between; align-items:flex-start; margin-bottom:12px; }}
-        .deal-header h3 {{ margin:0; }}
-        .deal-header p {{ margin:4px 0 0; color:#5a6b8c; }}
-        .detail-grid {{ width:100%; border-collapse: collapse; margin-top:10px; }}
-        .detail-grid th {{ background:#f5f7ff; text-transform:uppercase; font-size:0.75rem; letter-spacing:0.05em; padding:8px; color:#4d6090; }}
-        .detail-grid td {{ padding:8px; border-bottom:1px solid #eef2fb; font-weight:600; color:#16255a; }}
-    </style>
-    <div class="wrapper">
-        <h2>Deal Summary</h2>
-        {''.join(summary_table)}
-        <h2>Deal Details</h2>
-        {''.join(detail_sections)}
-    </div>
-    """
-    return html
+
+@functools.lru_cache(maxsize=1)
+def _win32_client():
+    # Imported on first use: pywin32 is slow to load and only the final draft
+    # step needs it, not the pool workers that re-import this module.
+    try:
+        import win32com.client as win32  # type: ignore
+    except ImportError:  # pragma: no cover
+        return None
+    return win32
 
 
 def open_outlook_draft(html_body: str, subject: str) -> None:
+    win32 = _win32_client()
     if win32 is None:
         print("pywin32 is not installed; skipping Outlook draft creation.")
         return
@@ -488,26 +982,43 @@ def open_outlook_draft(html_body: str, subject: str) -> None:
         print(f"Unable to open Outlook draft: {exc}")
 
 
+def process_all(work: List[Tuple[Dict[str, Any], Path]], workers: int) -> List[DealResult]:
+    results: List[DealResult] = []
+    if workers <= 1 or len(work) <= 1:
+        for config, workbook_path in work:
+            try:
+                results.append(process_file(config, workbook_path))
+            except Exception as exc:
+                print(f"Failed to process {workbook_path}: {exc}")
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(work))) as pool:
+        futures = [pool.submit(process_file, config, workbook_path) for config, workbook_path in work]
+        # Collect in submission order so the report keeps the config/file ordering.
+        for (_, workbook_path), future in zip(work, futures):
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                print(f"Failed to process {workbook_path}: {exc}")
+    return results
+
+
 def main() -> None:
     args = parse_args()
     config_dir = Path(args.config_dir)
     sample_dir = Path(args.sample_data)
 
     configs = load_configs(config_dir)
-    results: List[DealResult] = []
+    work: List[Tuple[Dict[str, Any], Path]] = []
 
     for config in configs:
         demo_workbook = ensure_demo_workbook(config, sample_dir, force=args.force_demo)
         matches = find_matching_files(config, sample_dir)
         if not matches:
             matches = [demo_workbook]
-        for workbook_path in matches:
-            try:
-                result = process_file(config, workbook_path)
-            except Exception as exc:
-                print(f"Failed to process {workbook_path}: {exc}")
-                continue
-            results.append(result)
+        work.extend((config, workbook_path) for workbook_path in matches)
+
+    results = process_all(work, args.workers)
 
     profile = load_report_profile(Path(args.report_profile))
     html_body = render_email(results, profile)
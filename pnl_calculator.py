@@ -13,13 +13,23 @@ What it does:
 
 from __future__ import annotations
 
+import bisect
+import contextlib
+import csv
 import dataclasses
 import datetime as dt
+import functools
+import io
+import itertools
 import math
-from typing import Dict, Iterable, List, Optional, Sequence
+import operator
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-import psycopg2
+from psycopg2.extensions import connection as PgConnection
 from psycopg2.extras import DictCursor
+from psycopg2.pool import ThreadedConnectionPool
 from pymfl import Dates, Quotes
 
 # ------------------------------------------------------------------------------
@@ -27,6 +37,9 @@ from pymfl import Dates, Quotes
 # ------------------------------------------------------------------------------
 
 DB_CONN = "<database_connection_string>"  # TODO: replace.
+POOL_MIN_CONN = 1
+POOL_MAX_CONN = 8
+DEAL_FETCH_BATCH = 2000            # rows per round trip from the deal cursor
 
 # Quote labels (pymfl)
 QUOTE_LABEL_30D = "SOFR_30D"
@@ -44,12 +57,48 @@ DAYCOUNT_ON = 36_500               # 365 * 100
 DIV_WAL_DRAWN = 3_650_000          # 365 * 10,000
 DIV_WAL_UNDRAWN = 365_000          # 365 * 1,000
 
+# table_2 column order; PnL row dicts are packed into tuples in this order.
+PNL_COLUMNS = (
+    "transit",
+    "client_name",
+    "business_date",
+    "fiscal_year",
+    "day_count",
+    "currency",
+    "min_utilization",
+    "min_utilization_amount",
+    "min_utilization_applied",
+    "drawn_balance",
+    "unused_balance",
+    "term_years",
+    "wal_years",
+    "funding_premium",
+    "applicable_margin",
+    "unused_fee",
+    "sofr_30d_t0",
+    "sofr_on_t0",
+    "sofr_30d_t1",
+    "sofr_on_t1",
+    "cost_of_funds_drawn",
+    "cost_of_funds_wal_undrawn",
+    "cost_of_funds_wal_drawn",
+    "unused_revenue",
+    "gross_revenue",
+    "gross_rate",
+    "pnl",
+)
+# An explicit NULL marker: with the CSV default, an empty string would load as NULL too.
+COPY_NULL = "\\N"
+COPY_PNL_SQL = f"COPY table_2 ({', '.join(PNL_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+
+_pnl_values = operator.itemgetter(*PNL_COLUMNS)
+
 
 # ------------------------------------------------------------------------------
 # Data classes
 # ------------------------------------------------------------------------------
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class DealRow:
     transit: str
     client_name: str
@@ -72,18 +121,17 @@ class DealRow:
     min_utilization_amount: Optional[float] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class WalSpreads:
-    """Funding premiums keyed by tenor year (1..10)."""
+    """Funding premiums for tenor years 1..10 (levels[0] is the 1Y premium)."""
 
-    levels: Dict[int, float]
+    levels: Tuple[float, ...]
 
     def by_year(self, years: int) -> float:
-        years = min(max(years, 1), 10)
-        return self.levels[years]
+        return self.levels[min(max(years, 1), 10) - 1]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class SofrRate:
     date: dt.date
     sofr_30d: float  # decimal
@@ -91,16 +139,83 @@ class SofrRate:
     # 30d values treated as percent (e.g., 5.25), Overnight treated as percent.
 
 
+@dataclasses.dataclass(slots=True)
+class SofrCurve:
+    """SOFR fixings sorted by date, for latest-on-or-before lookups."""
+
+    dates: List[dt.date]
+    rates: List[SofrRate]
+
+    @classmethod
+    def from_rates(cls, rates: Dict[dt.date, SofrRate]) -> "SofrCurve":
+        dates = sorted(rates)
+        return cls(dates=dates, rates=[rates[d] for d in dates])
+
+    def on_or_before(self, target: dt.date) -> Optional[SofrRate]:
+        idx = bisect.bisect_right(self.dates, target) - 1
+        return self.rates[idx] if idx >= 0 else None
+
+    def pickup(self, targets: Sequence[dt.date]) -> List[Optional[SofrRate]]:
+        """on_or_before() for each of an ascending run of dates, in one pass."""
+        dates, rates = self.dates, self.rates
+        bisect_right = bisect.bisect_right
+        picked: List[Optional[SofrRate]] = []
+        lo = 0
+        for target in targets:
+            lo = bisect_right(dates, target, lo)
+            picked.append(rates[lo - 1] if lo else None)
+        return picked
+
+
+# ------------------------------------------------------------------------------
+# Connections
+# ------------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def _pool(dsn: str) -> ThreadedConnectionPool:
+    return ThreadedConnectionPool(minconn=POOL_MIN_CONN, maxconn=POOL_MAX_CONN, dsn=dsn)
+
+
+@contextlib.contextmanager
+def pooled_connection(dsn: str) -> Iterator[PgConnection]:
+    """Borrow a pooled connection; commits on success, rolls back on error."""
+    pool = _pool(dsn)
+    connection = pool.getconn()
+    try:
+        with connection:
+            yield connection
+    finally:
+        pool.putconn(connection)
+
+
 # ------------------------------------------------------------------------------
 # Fetchers (replace with real queries/API)
 # ------------------------------------------------------------------------------
 
 def fetch_deal_rows(conn: str) -> List[DealRow]:
-    with psycopg2.connect(conn) as connection:
-        with connection.cursor(cursor_factory=DictCursor) as cur:
+    # Server-side cursor: rows arrive DEAL_FETCH_BATCH at a time, and the SELECT
+    # order matches DealRow's positional fields.
+    deals: List[DealRow] = []
+    with pooled_connection(conn) as connection:
+        with connection.cursor(name="deal_rows") as cur:
+            cur.itersize = DEAL_FETCH_BATCH
             cur.execute(
                 """
-                SELECT *
+                SELECT
+                    transit,
+                    client_name,
+                    business_date,
+                    closing_date,
+                    most_recent_amendment_date,
+                    revolving_period_end_date,
+                    facility_maturity_date,
+                    applicable_margin,
+                    unused_fee,
+                    currency,
+                    bmo_commitment,
+                    bmo_advances_outstanding,
+                    min_utilization,
+                    funding_premium
                 FROM (
                     SELECT
                         transit,
@@ -126,78 +241,85 @@ def fetch_deal_rows(conn: str) -> List[DealRow]:
                 WHERE rn = 1
                 """
             )
-            rows = cur.fetchall()
-
-    deals: List[DealRow] = []
-    for r in rows:
-        deals.append(
-            DealRow(
-                transit=r["transit"],
-                client_name=r["client_name"],
-                business_date=r["business_date"],
-                closing_date=r["closing_date"],
-                most_recent_amendment_date=r["most_recent_amendment_date"],
-                revolving_period_end_date=r["revolving_period_end_date"],
-                facility_maturity_date=r["facility_maturity_date"],
-                applicable_margin=r["applicable_margin"],
-                unused_fee=r["unused_fee"],
-                currency=r["currency"],
-                bmo_commitment=r["bmo_commitment"],
-                bmo_advances_outstanding=r["bmo_advances_outstanding"],
-                min_utilization=r["min_utilization"],
-                funding_premium=r["funding_premium"],
-            )
-        )
+            for *fields, min_utilization, funding_premium in cur:
+                deals.append(DealRow(*fields, float(min_utilization or 0.0), funding_premium))
     return deals
 
 
 def fetch_wal_spreads(conn: str, as_of: dt.date) -> WalSpreads:
     """Pull WAL funding premium grid from catr_rates (filter by business_date)."""
-    with psycopg2.connect(conn) as connection:
+    return fetch_wal_spreads_by_date(conn, [as_of])[as_of]
+
+
+def fetch_wal_spreads_by_date(conn: str, dates: Iterable[dt.date]) -> Dict[dt.date, WalSpreads]:
+    """Latest catr_rates grid on/before each date, fetched in a single query."""
+    wanted = sorted(set(dates))
+    if not wanted:
+        return {}
+    with pooled_connection(conn) as connection:
         with connection.cursor(cursor_factory=DictCursor) as cur:
             cur.execute(
                 """
                 SELECT
-                    one_year_fp  AS fp1,
-                    two_year_fp  AS fp2,
-                    three_year_fp AS fp3,
-                    four_year_fp  AS fp4,
-                    five_year_fp  AS fp5,
-                    six_year_fp   AS fp6,
-                    seven_year_fp AS fp7,
-                    eight_year_fp AS fp8,
-                    nine_year_fp  AS fp9,
-                    ten_year_fp   AS fp10
-                FROM catr_rates
-                WHERE business_date <= %s
-                ORDER BY business_date DESC
-                LIMIT 1
+                    d.as_of,
+                    c.fp1, c.fp2, c.fp3, c.fp4, c.fp5,
+                    c.fp6, c.fp7, c.fp8, c.fp9, c.fp10
+                FROM unnest(%s::date[]) AS d(as_of)
+                CROSS JOIN LATERAL (
+                    SELECT
+                        one_year_fp  AS fp1,
+                        two_year_fp  AS fp2,
+                        three_year_fp AS fp3,
+                        four_year_fp  AS fp4,
+                        five_year_fp  AS fp5,
+                        six_year_fp   AS fp6,
+                        seven_year_fp AS fp7,
+                        eight_year_fp AS fp8,
+                        nine_year_fp  AS fp9,
+                        ten_year_fp   AS fp10
+                    FROM catr_rates
+                    WHERE business_date <= d.as_of
+                    ORDER BY business_date DESC
+                    LIMIT 1
+                ) c
                 """,
-                (as_of,),
+                (wanted,),
             )
-            row = cur.fetchone()
-    if not row:
-        raise ValueError(f"No WAL spreads found on/before {as_of}")
+            rows = cur.fetchall()
 
-    levels = {i: row[f"fp{i}"] for i in range(1, 11)}
-    return WalSpreads(levels=levels)
+    grids = {
+        row["as_of"]: WalSpreads(levels=tuple(row[f"fp{i}"] for i in range(1, 11)))
+        for row in rows
+    }
+    for as_of in wanted:
+        if as_of not in grids:
+            raise ValueError(f"No WAL spreads found on/before {as_of}")
+    return grids
 
 
 def fetch_sofr_rates(_conn: str, start: dt.date, end: dt.date) -> Dict[dt.date, SofrRate]:
-    q = Quotes()
-    series_30d = q.TimeSeries([QUOTE_LABEL_30D], from_m=start, to=end, quote_label=QUOTE_LABEL_30D)
-    series_on = q.TimeSeries([QUOTE_LABEL_ON], from_m=start, to=end, quote_label=QUOTE_LABEL_ON)
+    # The two series are independent requests, so they are fetched concurrently
+    # (one Quotes client per request) and merged in one pass.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        future_30d = pool.submit(_fetch_quote_series, QUOTE_LABEL_30D, start, end)
+        future_on = pool.submit(_fetch_quote_series, QUOTE_LABEL_ON, start, end)
+        series_30d = future_30d.result()
+        series_on = future_on.result()
 
     rates: Dict[dt.date, SofrRate] = {}
-    for row in series_30d:
-        rates[row["date"]] = SofrRate(date=row["date"], sofr_30d=float(row["value"]), sofr_on=0.0)
-    for row in series_on:
-        existing = rates.get(row["date"]) or SofrRate(date=row["date"], sofr_30d=0.0, sofr_on=0.0)
-        existing.sofr_on = float(row["value"])
-        rates[row["date"]] = existing
+    for day, value in series_30d.items():
+        rates[day] = SofrRate(date=day, sofr_30d=value, sofr_on=series_on.get(day, 0.0))
+    for day, value in series_on.items():
+        if day not in rates:
+            rates[day] = SofrRate(date=day, sofr_30d=0.0, sofr_on=value)
     return rates
 
 
+def _fetch_quote_series(label: str, start: dt.date, end: dt.date) -> Dict[dt.date, float]:
+    rows = Quotes().TimeSeries([label], from_m=start, to=end, quote_label=label)
+    return {row["date"]: float(row["value"]) for row in rows}
+
+
 # ------------------------------------------------------------------------------
 # Date helpers
 # ------------------------------------------------------------------------------
@@ -209,9 +331,46 @@ def business_days(start: dt.date, end: dt.date) -> List[dt.date]:
     return list(_CAL.business_days(start, end, inclusive=True))
 
 
+@dataclasses.dataclass(slots=True)
+class BusinessDayIndex:
+    """Business days for a whole run, walked once; deals take slices of it."""
+
+    start: dt.date
+    end: dt.date
+    days: List[dt.date]
+    spans: List[int]
+
+    @classmethod
+    def build(cls, start: dt.date, end: dt.date) -> "BusinessDayIndex":
+        days = business_days(start, end)
+        return cls(start=start, end=end, days=days, spans=day_spans(days))
+
+    def with_spans(self, start: dt.date, end: dt.date) -> tuple[List[dt.date], List[int]]:
+        """Business days in [start, end] and their accrual spans."""
+        if start < self.start or end > self.end:
+            days = business_days(start, end)
+            return days, day_spans(days)
+        lo = bisect.bisect_left(self.days, start)
+        hi = bisect.bisect_right(self.days, end)
+        days = self.days[lo:hi]
+        spans = self.spans[lo:hi]
+        # Interior spans match the full run; the slice's first day has no previous
+        # day and its last day no next day, so those two are re-derived.
+        if spans:
+            spans[0] = day_span_for_date(0, days)
+            spans[-1] = day_span_for_date(len(days) - 1, days)
+        return days, spans
+
+
 def fiscal_year_for(day: dt.date) -> str:
     """Fiscal year starts Nov 1; FY label uses end-year (e.g., Nov-2023 -> FY2024)."""
-    end_year = day.year + 1 if day.month >= 11 else day.year
+    return _fiscal_year_label(day.year, day.month)
+
+
+@functools.lru_cache(maxsize=256)
+def _fiscal_year_label(year: int, month: int) -> str:
+    # A run spans a few dozen (year, month) pairs, so every day reuses one label.
+    end_year = year + 1 if month >= 11 else year
     return f"FY{end_year}"
 
 
@@ -226,18 +385,23 @@ def day_span_for_date(idx: int, ordered_days: Sequence[dt.date]) -> int:
     return 1
 
 
+def day_spans(ordered_days: Sequence[dt.date]) -> List[int]:
+    return [day_span_for_date(idx, ordered_days) for idx in range(len(ordered_days))]
+
+
 # ------------------------------------------------------------------------------
 # Core calculations
 # ------------------------------------------------------------------------------
 
 def compute_derived_fields(deal: DealRow) -> DealRow:
-    term_days = (deal.revolving_period_end_date - deal.most_recent_amendment_date).days
-    deal.term_years = math.ceil(term_days / 360)
-
-    wal_days = (deal.facility_maturity_date - deal.revolving_period_end_date).days
-    deal.wal_years = ((wal_days * 0.5) / 360) + (deal.term_years or 0)
-
-    deal.min_utilization_amount = (deal.min_utilization or 0) * deal.bmo_commitment if deal.min_utilization else 0
+    revolving_end = deal.revolving_period_end_date
+    term_years = math.ceil((revolving_end - deal.most_recent_amendment_date).days / 360)
+    wal_days = (deal.facility_maturity_date - revolving_end).days
+
+    min_utilization = deal.min_utilization
+    deal.term_years = term_years
+    deal.wal_years = ((wal_days * 0.5) / 360) + term_years
+    deal.min_utilization_amount = min_utilization * deal.bmo_commitment if min_utilization else 0
     return deal
 
 
@@ -259,6 +423,48 @@ def calculate_balances(deal: DealRow) -> tuple[float, float, bool]:
     return drawn, unused, False
 
 
+def _wal_bases(
+    advances_outstanding: float,
+    unused_base: float,
+    min_util_amount: float,
+    commitment: float,
+) -> tuple[float, float]:
+    use_min = min_util_amount > advances_outstanding
+    wal_drawn_base = min_util_amount if use_min else advances_outstanding
+    wal_undrawn_base = (commitment - min_util_amount) if use_min else unused_base
+    return wal_drawn_base, wal_undrawn_base
+
+
+def _span_components(
+    daycount: int,
+    wal_drawn_base: float,
+    wal_undrawn_base: float,
+    funding_premium: float,
+    unused_fee: float,
+    spread_mult: float,
+) -> tuple[float, float, float]:
+    """Components that depend on the day count but not on SOFR (undrawn WAL, drawn WAL, unused revenue)."""
+    cost_of_funds_wal_drawn = (wal_drawn_base * daycount * funding_premium) / DIV_WAL_DRAWN
+    cost_of_funds_wal_undrawn = (spread_mult * funding_premium * daycount * wal_undrawn_base) / DIV_WAL_UNDRAWN
+    unused_revenue = (unused_fee * daycount * wal_undrawn_base) / DAYCOUNT_DAILY
+    return cost_of_funds_wal_undrawn, cost_of_funds_wal_drawn, unused_revenue
+
+
+def _rate_components(
+    daycount: int,
+    advances_outstanding: float,
+    wal_drawn_base: float,
+    applicable_margin: float,
+    sofr_on_t1: float,
+    sofr_30d_t1: float,
+) -> tuple[float, float, float]:
+    """Components driven by the prior-day SOFR fixings (drawn cost of funds, gross rate, gross revenue)."""
+    cost_of_funds_drawn = (advances_outstanding * sofr_on_t1 * daycount) / DAYCOUNT_ON
+    gross_rate = (sofr_30d_t1 / 100) + applicable_margin
+    gross_revenue = (gross_rate * daycount * wal_drawn_base) / DAYCOUNT_DAILY
+    return cost_of_funds_drawn, gross_rate, gross_revenue
+
+
 def compute_pnl_components(
     *,
     daycount: int,
@@ -274,18 +480,13 @@ def compute_pnl_components(
     sofr_on_t1: float,
     sofr_30d_t1: float,
 ) -> Dict[str, float]:
-    use_min = min_util_amount > advances_outstanding
-
-    wal_drawn_base = min_util_amount if use_min else advances_outstanding
-    wal_undrawn_base = (commitment - min_util_amount) if use_min else unused_base
-
-    cost_of_funds_drawn = (advances_outstanding * sofr_on_t1 * daycount) / DAYCOUNT_ON
-    cost_of_funds_wal_drawn = (wal_drawn_base * daycount * funding_premium) / DIV_WAL_DRAWN
-    cost_of_funds_wal_undrawn = (spread_mult * funding_premium * daycount * wal_undrawn_base) / DIV_WAL_UNDRAWN
-
-    unused_revenue = (unused_fee * daycount * wal_undrawn_base) / DAYCOUNT_DAILY
-    gross_rate = (sofr_30d_t1 / 100) + applicable_margin
-    gross_revenue = (gross_rate * daycount * wal_drawn_base) / DAYCOUNT_DAILY
+    wal_drawn_base, wal_undrawn_base = _wal_bases(advances_outstanding, unused_base, min_util_amount, commitment)
+    cost_of_funds_wal_undrawn, cost_of_funds_wal_drawn, unused_revenue = _span_components(
+        daycount, wal_drawn_base, wal_undrawn_base, funding_premium, unused_fee, spread_mult
+    )
+    cost_of_funds_drawn, gross_rate, gross_revenue = _rate_components(
+        daycount, advances_outstanding, wal_drawn_base, applicable_margin, sofr_on_t1, sofr_30d_t1
+    )
 
     pnl = (
         cost_of_funds_drawn
@@ -306,174 +507,221 @@ def compute_pnl_components(
     }
 
 
-def _closest_rate(target: dt.date, rates: Dict[dt.date, SofrRate]) -> Optional[SofrRate]:
-    """Pick the latest available rate on or before target."""
-    eligible = [d for d in rates if d <= target]
-    if not eligible:
-        return None
-    return rates[max(eligible)]
-
-
 def build_pnl_rows(
     deal: DealRow,
     wal_grid: WalSpreads,
-    rates: Dict[dt.date, SofrRate],
+    rates: Dict[dt.date, SofrRate] | SofrCurve,
     start: dt.date,
     end: dt.date,
+    calendar: Optional[BusinessDayIndex] = None,
 ) -> List[dict]:
-    days = business_days(start, end)
-    rows: List[dict] = []
+    return [
+        dict(zip(PNL_COLUMNS, values))
+        for values in iter_pnl_values(deal, wal_grid, rates, start, end, calendar)
+    ]
+
+
+def iter_pnl_values(
+    deal: DealRow,
+    wal_grid: WalSpreads,
+    rates: Dict[dt.date, SofrRate] | SofrCurve,
+    start: dt.date,
+    end: dt.date,
+    calendar: Optional[BusinessDayIndex] = None,
+) -> Iterator[tuple]:
+    """Yield one PnL row per business day as a tuple in PNL_COLUMNS order."""
+    if calendar:
+        days, spans = calendar.with_spans(start, end)
+    else:
+        days = business_days(start, end)
+        spans = day_spans(days)
+    curve = rates if isinstance(rates, SofrCurve) else SofrCurve.from_rates(rates)
     drawn_balance, unused_balance, min_applied = calculate_balances(deal)
     fp_rate = select_fp_rate(deal, wal_grid)
 
-    for idx, biz_day in enumerate(days):
-        span_days = day_span_for_date(idx, days)
-        rate_t0 = rates.get(biz_day) or _closest_rate(biz_day, rates)
+    # Everything read from the deal is constant across its days.
+    transit = deal.transit
+    client_name = deal.client_name
+    currency = deal.currency
+    term_years = deal.term_years
+    wal_years = deal.wal_years
+    advances = deal.bmo_advances_outstanding
+    margin = deal.applicable_margin
+    unused_fee = deal.unused_fee
+    min_utilization = deal.min_utilization or 0
+    min_util_amount = deal.min_utilization_amount or 0
+    spread_mult = TRANSIT_MULTIPLIERS.get(transit, 0)
+
+    drawn_base = drawn_balance if not min_applied else min_util_amount
+    drawn_base = drawn_base or drawn_balance
+    unused_base = unused_balance if not min_applied else max(deal.bmo_commitment - min_util_amount, 0)
+    wal_drawn_base, wal_undrawn_base = _wal_bases(advances, unused_base, min_util_amount, deal.bmo_commitment)
+    # Spans only take a handful of values (1, 3, holiday/month-end folds), so the
+    # SOFR-independent components are computed once per distinct span.
+    span_components: Dict[int, tuple[float, float, float]] = {}
+
+    one_day = dt.timedelta(days=1)
+    rates_t0 = curve.pickup(days)
+    rates_t1 = curve.pickup([biz_day - one_day for biz_day in days])
+    for biz_day, span_days, rate_t0, rate_t1 in zip(days, spans, rates_t0, rates_t1):
         if not rate_t0:
             raise ValueError(f"No SOFR rate available for {biz_day}")
-        rate_t1 = _closest_rate(biz_day - dt.timedelta(days=1), rates)
         if not rate_t1:
             raise ValueError(f"No prior SOFR rate available for {biz_day}")
 
         daycount = span_days
 
-        drawn_base = drawn_balance if not min_applied else deal.min_utilization_amount or 0
-        drawn_base = drawn_base or drawn_balance
-        unused_base = unused_balance if not min_applied else max(deal.bmo_commitment - (deal.min_utilization_amount or 0), 0)
-
-        components = compute_pnl_components(
-            daycount=daycount,
-            advances_outstanding=deal.bmo_advances_outstanding,
-            drawn_base=drawn_base,
-            unused_base=unused_base,
-            min_util_amount=deal.min_utilization_amount or 0,
-            commitment=deal.bmo_commitment,
-            funding_premium=fp_rate,
-            unused_fee=deal.unused_fee,
-            applicable_margin=deal.applicable_margin,
-            spread_mult=TRANSIT_MULTIPLIERS.get(deal.transit, 0),
-            sofr_on_t1=rate_t1.sofr_on,
-            sofr_30d_t1=rate_t1.sofr_30d,
+        fixed = span_components.get(daycount)
+        if fixed is None:
+            fixed = span_components[daycount] = _span_components(
+                daycount, wal_drawn_base, wal_undrawn_base, fp_rate, unused_fee, spread_mult
+            )
+        cost_of_funds_wal_undrawn, cost_of_funds_wal_drawn, unused_revenue = fixed
+        sofr_on_t1 = rate_t1.sofr_on
+        sofr_30d_t1 = rate_t1.sofr_30d
+        cost_of_funds_drawn, gross_rate, gross_revenue = _rate_components(
+            daycount, advances, wal_drawn_base, margin, sofr_on_t1, sofr_30d_t1
+        )
+        pnl = (
+            cost_of_funds_drawn
+            + cost_of_funds_wal_undrawn
+            + cost_of_funds_wal_drawn
+            + unused_revenue
+            + gross_revenue
         )
 
-        rows.append(
-            {
-                "transit": deal.transit,
-                "client_name": deal.client_name,
-                "business_date": biz_day,
-                "fiscal_year": fiscal_year_for(biz_day),
-                "day_count": span_days,
-                "currency": deal.currency,
-                "min_utilization": deal.min_utilization or 0,
-                "min_utilization_amount": deal.min_utilization_amount or 0,
-                "min_utilization_applied": min_applied,
-                "drawn_balance": drawn_base,
-                "unused_balance": unused_base,
-                "term_years": deal.term_years,
-                "wal_years": deal.wal_years,
-                "funding_premium": fp_rate,
-                "applicable_margin": deal.applicable_margin,
-                "unused_fee": deal.unused_fee,
-                "sofr_30d_t0": rate_t0.sofr_30d,
-                "sofr_on_t0": rate_t0.sofr_on,
-                "sofr_30d_t1": rate_t1.sofr_30d,
-                "sofr_on_t1": rate_t1.sofr_on,
-                "gross_rate": components["gross_rate"],
-                "cost_of_funds_drawn": components["cost_of_funds_drawn"],
-                "cost_of_funds_wal_undrawn": components["cost_of_funds_wal_undrawn"],
-                "cost_of_funds_wal_drawn": components["cost_of_funds_wal_drawn"],
-                "unused_revenue": components["unused_revenue"],
-                "gross_revenue": components["gross_revenue"],
-                "pnl": components["pnl"],
-            }
+        yield (
+            transit,
+            client_name,
+            biz_day,
+            fiscal_year_for(biz_day),
+            span_days,
+            currency,
+            min_utilization,
+            min_util_amount,
+            min_applied,
+            drawn_base,
+            unused_base,
+            term_years,
+            wal_years,
+            fp_rate,
+            margin,
+            unused_fee,
+            rate_t0.sofr_30d,
+            rate_t0.sofr_on,
+            sofr_30d_t1,
+            sofr_on_t1,
+            cost_of_funds_drawn,
+            cost_of_funds_wal_undrawn,
+            cost_of_funds_wal_drawn,
+            unused_revenue,
+            gross_revenue,
+            gross_rate,
+            pnl,
         )
-    return rows
 
 
 # ------------------------------------------------------------------------------
 # Persistence
 # ------------------------------------------------------------------------------
 
+class _CsvStream(io.TextIOBase):
+    """Read-only text stream that renders rows to CSV as COPY reads it."""
+
+    def __init__(self, rows: Iterable[Sequence], batch_size: int = 512) -> None:
+        self._rows = iter(rows)
+        self._batch_size = batch_size
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._pending = ""
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _render_batch(self) -> str:
+        self._writer.writerows(
+            [COPY_NULL if value is None else value for value in row] if None in row else row
+            for row in itertools.islice(self._rows, self._batch_size)
+        )
+        chunk = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return chunk
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None:
+            size = -1
+        # Reads advance an offset into the rendered text; it is only re-joined
+        # when a read runs past the end, once per batch.
+        available = len(self._pending) - self._offset
+        if size < 0 or available < size:
+            parts = [self._pending[self._offset:]]
+            while size < 0 or available < size:
+                chunk = self._render_batch()
+                if not chunk:
+                    break
+                parts.append(chunk)
+                available += len(chunk)
+            self._pending = "".join(parts)
+            self._offset = 0
+        if size < 0:
+            out, self._pending = self._pending, ""
+            return out
+        out = self._pending[self._offset:self._offset + size]
+        self._offset += len(out)
+        return out
+
+
 def store_pnl_rows(conn: str, rows: Iterable[dict]) -> None:
     """
     Insert/upsert rows into SQL table 2.
     """
-    if not rows:
+    store_pnl_values(conn, (_pnl_values(row) for row in rows))
+
+
+def store_pnl_values(conn: str, values: Iterable[Sequence]) -> None:
+    """
+    Stream row tuples (PNL_COLUMNS order) into SQL table 2.
+
+    Rows go through COPY ... FROM STDIN as CSV in a single transaction and are
+    rendered as COPY consumes them, so the full result set is never held in
+    memory. Dates go out as ISO strings and None as the COPY_NULL marker, so
+    empty strings stay empty strings.
+    """
+    values = iter(values)
+    first = next(values, None)
+    if first is None:
         return
-    with psycopg2.connect(conn) as connection:
+    with pooled_connection(conn) as connection:
         with connection.cursor() as cur:
-            cur.executemany(
-                """
-                INSERT INTO table_2 (
-                    transit,
-                    client_name,
-                    business_date,
-                    fiscal_year,
-                    day_count,
-                    currency,
-                    min_utilization,
-                    min_utilization_amount,
-                    min_utilization_applied,
-                    drawn_balance,
-                    unused_balance,
-                    term_years,
-                    wal_years,
-                    funding_premium,
-                    applicable_margin,
-                    unused_fee,
-                    sofr_30d_t0,
-                    sofr_on_t0,
-                    sofr_30d_t1,
-                    sofr_on_t1,
-                    cost_of_funds_drawn,
-                    cost_of_funds_wal_undrawn,
-                    cost_of_funds_wal_drawn,
-                    unused_revenue,
-                    gross_revenue,
-                    gross_rate,
-                    pnl
-                )
-                VALUES (
-                    %(transit)s,
-                    %(client_name)s,
-                    %(business_date)s,
-                    %(fiscal_year)s,
-                    %(day_count)s,
-                    %(currency)s,
-                    %(min_utilization)s,
-                    %(min_utilization_amount)s,
-                    %(min_utilization_applied)s,
-                    %(drawn_balance)s,
-                    %(unused_balance)s,
-                    %(term_years)s,
-                    %(wal_years)s,
-                    %(funding_premium)s,
-                    %(applicable_margin)s,
-                    %(unused_fee)s,
-                    %(sofr_30d_t0)s,
-                    %(sofr_on_t0)s,
-                    %(sofr_30d_t1)s,
-                    %(sofr_on_t1)s,
-                    %(cost_of_funds_drawn)s,
-                    %(cost_of_funds_wal_undrawn)s,
-                    %(cost_of_funds_wal_drawn)s,
-                    %(unused_revenue)s,
-                    %(gross_revenue)s,
-                    %(gross_rate)s,
-                    %(pnl)s
-                )
-                """,
-                list(rows),
-            )
+            cur.copy_expert(COPY_PNL_SQL, _CsvStream(itertools.chain((first,), values)))
 
 
 # ------------------------------------------------------------------------------
 # Orchestration
 # ------------------------------------------------------------------------------
 
+_worker_rates: Optional[SofrCurve] = None
+_worker_calendar: Optional[BusinessDayIndex] = None
+
+
+def _init_worker(rates: SofrCurve, calendar: BusinessDayIndex) -> None:
+    # Shared run-wide tables are shipped to each worker once, not per deal.
+    global _worker_rates, _worker_calendar
+    _worker_rates = rates
+    _worker_calendar = calendar
+
+
+def _deal_values(task: tuple[DealRow, WalSpreads, dt.date, dt.date]) -> List[tuple]:
+    deal, wal_grid, start, end = task
+    return list(iter_pnl_values(deal, wal_grid, _worker_rates, start, end, _worker_calendar))
+
+
 def calculate_pnl_for_all_deals(
     start_override: Optional[dt.date] = None,
     end_override: Optional[dt.date] = None,
+    workers: Optional[int] = None,
 ) -> None:
     deals = [compute_derived_fields(d) for d in fetch_deal_rows(DB_CONN)]
     if not deals:
@@ -482,22 +730,35 @@ def calculate_pnl_for_all_deals(
 
     overall_start = start_override or min(d.closing_date for d in deals)
     overall_end = end_override or dt.date.today()
-    rates = fetch_sofr_rates(DB_CONN, overall_start, overall_end)
+    rates = SofrCurve.from_rates(fetch_sofr_rates(DB_CONN, overall_start, overall_end))
+
+    wal_grids = fetch_wal_spreads_by_date(DB_CONN, (d.most_recent_amendment_date for d in deals))
+    calendar = BusinessDayIndex.build(min(overall_start, min(d.closing_date for d in deals)), overall_end)
 
-    all_rows: List[dict] = []
-    for deal in deals:
-        wal_grid = fetch_wal_spreads(DB_CONN, deal.most_recent_amendment_date)
-        all_rows.extend(
-            build_pnl_rows(
+    workers = min(workers or os.cpu_count() or 1, len(deals))
+    if workers <= 1:
+        values = itertools.chain.from_iterable(
+            iter_pnl_values(
                 deal=deal,
-                wal_grid=wal_grid,
+                wal_grid=wal_grids[deal.most_recent_amendment_date],
                 rates=rates,
                 start=deal.closing_date,
                 end=overall_end,
+                calendar=calendar,
             )
+            for deal in deals
         )
+        store_pnl_values(DB_CONN, values)
+        return
 
-    store_pnl_rows(DB_CONN, all_rows)
+    # Deals are independent; results come back in deal order and stream into COPY.
+    tasks = [
+        (deal, wal_grids[deal.most_recent_amendment_date], deal.closing_date, overall_end)
+        for deal in deals
+    ]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rates, calendar)) as pool:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        store_pnl_values(DB_CONN, itertools.chain.from_iterable(pool.map(_deal_values, tasks, chunksize=chunksize)))
 
 
 if __name__ == "__main__":